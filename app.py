@@ -4,10 +4,11 @@ from __future__ import annotations
 
 import logging
 import os
+import shutil
 import threading
-import time
 import uuid
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, fields, replace
 from typing import Dict, Optional
 
 from flask import Flask, jsonify, render_template, request, send_from_directory
@@ -33,6 +34,9 @@ class Job:
     error_message: str | None = None
 
 
+_JOB_FIELDS = frozenset(field.name for field in fields(Job))
+
+
 class InMemoryJobStore:
     """Thread-safe in-memory storage for translation jobs."""
 
@@ -54,30 +58,32 @@ class InMemoryJobStore:
         return job
 
     def get_job(self, job_id: str) -> Optional[Job]:
-        with self._lock:
-            return self._jobs.get(job_id)
+        # Stored jobs are never mutated in place and a single dict lookup is
+        # atomic under the GIL, so status polling does not need the lock.
+        return self._jobs.get(job_id)
 
     def update_job(self, job_id: str, **updates: object) -> Optional[Job]:
+        changes = {key: value for key, value in updates.items() if key in _JOB_FIELDS}
         with self._lock:
             job = self._jobs.get(job_id)
             if not job:
                 return None
-            for key, value in updates.items():
-                if hasattr(job, key):
-                    setattr(job, key, value)
+            job = replace(job, **changes)
+            self._jobs[job_id] = job
             return job
 
-    def next_pending_job(self) -> Optional[Job]:
-        with self._lock:
-            for job in self._jobs.values():
-                if job.status == "pending":
-                    job.status = "running"
-                    return job
-        return None
-
 
 job_store = InMemoryJobStore()
 
+# Jobs are dominated by network I/O to the NLLB space, so several of them can
+# run side by side. Worker threads are only spawned once a job is submitted.
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("JOB_WORKERS", "4")), thread_name_prefix="job"
+)
+
+# Uploads are copied to disk in 1 MiB chunks rather than Werkzeug's 16 KiB default.
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 app = Flask(__name__)
 
 
@@ -94,7 +100,10 @@ def _save_upload(file: FileStorage) -> str:
     filename = secure_filename(file.filename or "uploaded.pdf")
     unique_name = f"{uuid.uuid4()}_{filename}" if filename else str(uuid.uuid4())
     destination = UPLOAD_DIR / unique_name
-    file.save(destination)
+    with open(destination, "wb") as out:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        shutil.copyfileobj(file.stream, out, length=UPLOAD_CHUNK_SIZE)
     logger.info("Saved upload %s to %s", filename, destination)
     return unique_name
 
@@ -105,6 +114,7 @@ def _process_pdf_job(job: Job) -> None:
     original_path = UPLOAD_DIR / job.filename_original
     translated_name = f"translated_{job.id}.pdf"
     translated_path = TRANSLATED_DIR / translated_name
+    job_store.update_job(job.id, status="running")
 
     try:
         logger.info(
@@ -125,25 +135,6 @@ def _process_pdf_job(job: Job) -> None:
     logger.info("Completed translation job %s", job.id)
 
 
-def _worker_loop(poll_interval: float = 1.0) -> None:
-    """Continuously pick up pending jobs and process them."""
-
-    while True:
-        job = job_store.next_pending_job()
-        if job:
-            _process_pdf_job(job)
-        else:
-            time.sleep(poll_interval)
-
-
-def start_worker() -> None:
-    """Spawn the background worker thread if not already running."""
-
-    worker = threading.Thread(target=_worker_loop, daemon=True, name="job-worker")
-    worker.start()
-    logger.info("Background worker thread started")
-
-
 @app.route("/api/upload", methods=["POST"])
 def upload_pdf():
     """Accept a PDF upload, create a job, and return its identifier."""
@@ -157,6 +148,7 @@ def upload_pdf():
 
     saved_name = _save_upload(uploaded)
     job = job_store.create_job(filename_original=saved_name)
+    EXECUTOR.submit(_process_pdf_job, job)
     return jsonify({"job_id": job.id}), 202
 
 
@@ -193,11 +185,5 @@ def download(job_id: str):
     )
 
 
-# Only start the worker in the main process to avoid duplicate threads when the
-# Flask debug reloader imports this module multiple times.
-if os.environ.get("WERKZEUG_RUN_MAIN") in (None, "true"):
-    start_worker()
-
-
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -22,6 +22,13 @@ UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", BASE_DIR / "uploads")).resolve()
 # ``TRANSLATED_DIR`` environment variable to customize output location.
 TRANSLATED_DIR = Path(os.getenv("TRANSLATED_DIR", BASE_DIR / "translated")).resolve()
 
+# SQLite database used to persist translations across jobs so repeated text
+# (headers, captions, boilerplate) is only sent to the NLLB space once. Can be
+# overridden via the ``TRANSLATION_CACHE_PATH`` environment variable.
+TRANSLATION_CACHE_PATH = Path(
+    os.getenv("TRANSLATION_CACHE_PATH", BASE_DIR / "translation_cache.sqlite3")
+).resolve()
+
 # Default language settings for the translation pipeline. These can be
 # overridden by environment variables to support different language pairs.
 DEFAULT_SOURCE_LANGUAGE = os.getenv("DEFAULT_SOURCE_LANGUAGE", "English")
@@ -31,6 +38,12 @@ DEFAULT_TARGET_LANGUAGE = os.getenv("DEFAULT_TARGET_LANGUAGE", "Western Persian"
 # ``HF_API_TOKEN`` environment variable so secrets are not committed to code.
 HUGGINGFACE_TOKEN = os.getenv("HF_API_TOKEN")
 
+# Directory holding an NLLB model converted for CTranslate2 (for example
+# ``nllb-200-distilled-600M`` quantized to int8). When set, and ``ctranslate2``
+# and ``transformers`` are installed, blocks are translated in-process instead
+# of through the UNESCO NLLB space. Read from ``LOCAL_NLLB_MODEL_DIR``.
+LOCAL_NLLB_MODEL_DIR = os.getenv("LOCAL_NLLB_MODEL_DIR", "")
+
 # Logging level for the entire application. Accepts standard logging level
 # names (e.g., ``DEBUG``, ``INFO``, ``WARNING``, ``ERROR``). Defaults to ``INFO``.
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -0,0 +1,68 @@
+"""Optional Numba-compiled character counter for :mod:`core.formula_detector`.
+
+Importing this module requires ``numba`` and ``numpy``; the detector falls back
+to its pure-Python implementation when they are not installed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+import numba
+import numpy as np
+
+_BMP_SIZE = 0x10000
+_MATH = 8
+
+
+@numba.njit(cache=True)
+def _count(codepoints, class_table, math_codepoints):
+    spaces = 0
+    non_alpha = 0
+    digits = 0
+    seen = np.zeros(math_codepoints.shape[0], dtype=np.bool_)
+    limit = class_table.shape[0]
+
+    for c in codepoints:
+        if c >= limit:
+            return -1, 0, 0, 0
+        code = class_table[c]
+        if code & 1:
+            spaces += 1
+        if code & 2:
+            non_alpha += 1
+        if code & 4:
+            digits += 1
+        if code & _MATH:
+            seen[np.searchsorted(math_codepoints, c)] = True
+
+    return spaces, non_alpha, digits, seen.sum()
+
+
+def make_counter(
+    classify: Callable[[str], int], math_symbols: Iterable[str]
+) -> Callable[[str], tuple[int, int, int, int] | None]:
+    """Build a compiled counter matching the detector's character classes.
+
+    ``classify`` is evaluated once for every code point in the Basic
+    Multilingual Plane so the kernel only performs table lookups; it must set
+    bit ``8`` for members of ``math_symbols``. The returned
+    callable yields ``(spaces, non_alpha, digits, distinct_math_symbols)`` or
+    ``None`` when the text contains code points outside the table.
+    """
+
+    class_table = np.fromiter(
+        (classify(chr(c)) for c in range(_BMP_SIZE)), dtype=np.uint8, count=_BMP_SIZE
+    )
+    math_codepoints = np.array(sorted(ord(symbol) for symbol in math_symbols), dtype=np.uint32)
+
+    def count(text: str) -> tuple[int, int, int, int] | None:
+        codepoints = np.frombuffer(
+            text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32
+        )
+        spaces, non_alpha, digits, math = _count(codepoints, class_table, math_codepoints)
+        if spaces < 0:
+            return None
+        return int(spaces), int(non_alpha), int(digits), int(math)
+
+    return count
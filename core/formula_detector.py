@@ -7,10 +7,13 @@ on many small blocks of text extracted from PDFs.
 
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import Final
+from collections import Counter
+from collections.abc import Callable
+from functools import cache
+from typing import TYPE_CHECKING, Final
 
-from core.pdf_layout_extractor import TextBlock
+if TYPE_CHECKING:
+    from core.pdf_layout_extractor import TextBlock
 
 # Heuristic thresholds can be tuned depending on the characteristics of
 # extracted text. They are exposed as module-level constants so callers can
@@ -77,10 +80,86 @@ MATH_SYMBOLS: Final[frozenset[str]] = frozenset(
 """Characters commonly found in mathematical expressions."""
 
 
-def _ratio(predicate: Iterable[bool], total: int) -> float:
-    """Compute a ratio while guarding against division by zero."""
+_SPACE: Final[int] = 1
+_NON_ALPHA: Final[int] = 2
+_DIGIT: Final[int] = 4
+_MATH: Final[int] = 8
 
-    return sum(1 for match in predicate if match) / total if total else 0.0
+
+def _classify(char: str) -> int:
+    """Return the character-class bitmask used by the formula heuristics."""
+
+    code = 0
+    if char.isspace():
+        code |= _SPACE
+    if not char.isalpha():
+        code |= _NON_ALPHA
+    if char.isdigit():
+        code |= _DIGIT
+    if char in MATH_SYMBOLS:
+        code |= _MATH
+    return code
+
+
+class _CharClasses(dict):
+    """Memoized character classes for code points outside the ASCII table."""
+
+    def __missing__(self, char: str) -> int:
+        code = self[char] = _classify(char)
+        return code
+
+
+_ASCII_CLASS_TABLE: Final[bytes] = bytes(_classify(chr(c)) for c in range(128)) + bytes(128)
+"""Lookup table mapping each ASCII byte to its class bitmask for ``bytes.translate``."""
+
+_CHAR_CLASSES = _CharClasses()
+
+NATIVE_MIN_LENGTH: Final[int] = 128
+"""Shortest text routed to the compiled kernel; shorter strings stay in Python."""
+
+
+@cache
+def _native_counter() -> Callable[[str], tuple[int, int, int, int] | None] | None:
+    """Load the compiled kernel on first use, or ``None`` if it is unavailable."""
+
+    try:
+        from core._formula_kernel import make_counter
+    except ImportError:  # numba/numpy are optional accelerators
+        return None
+    return make_counter(_classify, MATH_SYMBOLS)
+
+
+def _count_classes(text: str) -> tuple[int, int, int, int]:
+    """Count spaces, non-alphabetic characters, digits, and distinct math symbols."""
+
+    if len(text) >= NATIVE_MIN_LENGTH:
+        native_count_classes = _native_counter()
+        if native_count_classes is not None:
+            counts = native_count_classes(text)
+            if counts is not None:
+                return counts
+
+    if text.isascii():
+        codes = Counter(text.encode("ascii").translate(_ASCII_CLASS_TABLE))
+    else:
+        codes = Counter(map(_CHAR_CLASSES.__getitem__, text))
+
+    spaces = non_alpha = digits = 0
+    has_math = False
+    for code, count in codes.items():
+        if code & _SPACE:
+            spaces += count
+        if code & _NON_ALPHA:
+            non_alpha += count
+        if code & _DIGIT:
+            digits += count
+        if code & _MATH:
+            has_math = True
+
+    # Membership is already encoded in the class table; only texts that
+    # contain a math symbol pay for counting the distinct ones.
+    math_symbols = len(MATH_SYMBOLS.intersection(text)) if has_math else 0
+    return spaces, non_alpha, digits, math_symbols
 
 
 def is_formula_like(text: str) -> bool:
@@ -104,10 +183,10 @@ def is_formula_like(text: str) -> bool:
         return False
 
     length = len(normalized)
-    space_ratio = _ratio((char.isspace() for char in normalized), length)
-    non_alpha_ratio = _ratio((not char.isalpha() for char in normalized), length)
-    digit_ratio = _ratio((char.isdigit() for char in normalized), length)
-    math_symbol_count = len({char for char in normalized if char in MATH_SYMBOLS})
+    spaces, non_alpha, digits, math_symbol_count = _count_classes(normalized)
+    space_ratio = spaces / length
+    non_alpha_ratio = non_alpha / length
+    digit_ratio = digits / length
 
     dense_symbols = non_alpha_ratio >= NON_ALPHA_RATIO_THRESHOLD
     compact_spacing = space_ratio <= MAX_SPACE_RATIO
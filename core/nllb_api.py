@@ -2,21 +2,497 @@
 
 from __future__ import annotations
 
-from gradio_client import Client
+import asyncio
+import importlib.util
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
 
-client = Client("UNESCO/nllb")  # public space
+from core.translation_cache import translation_cache
 
+if TYPE_CHECKING:
+    import httpx
+    import requests
+    from gradio_client import Client
 
-def translate(text: str, src: str = "English", tgt: str = "Western Persian") -> str:
+logger = logging.getLogger(__name__)
+
+SPACE_ID = "UNESCO/nllb"  # public space
+
+# Direct HTTP endpoint of the space. Requests are posted over a keep-alive
+# session and only fall back to gradio_client when the endpoint cannot be
+# resolved. Set ``NLLB_SPACE_URL`` to an empty string to always use the client.
+SPACE_URL = os.getenv("NLLB_SPACE_URL", "https://unesco-nllb.hf.space").rstrip("/")
+REQUEST_TIMEOUT = 120.0
+
+# A failed ``/config`` lookup (for example a 503 while the space cold-starts) is
+# retried after this many seconds; only a config without the endpoint is final.
+REST_RETRY_COOLDOWN = 60.0
+
+_session: requests.Session | None = None
+_fn_index: int | None = None
+_rest_resolved = False
+_rest_retry_at = 0.0
+_rest_lock = threading.Lock()
+
+# A single client serializes its requests, so a small pool of them is kept per
+# Hugging Face token to let concurrent translations reach the space in
+# parallel. Clients are only created when a request finds the pool empty.
+CLIENT_POOL_SIZE = max(1, int(os.getenv("NLLB_CLIENTS", "4")))
+
+# Default number of translation requests a translator keeps in flight. The
+# calls are network-bound, so overlapping them hides most of the round trip.
+DEFAULT_MAX_WORKERS = 8
+
+# Upper bound on requests sent to the public space at once by this process,
+# across all jobs and both the direct endpoint and gradio_client.
+MAX_IN_FLIGHT = max(1, int(os.getenv("NLLB_MAX_IN_FLIGHT", "8")))
+_in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+_SLOT_POLL_INTERVAL = 0.05
+
+# Transient failures (timeouts, dropped connections, 429 and 5xx responses) are
+# retried with exponential backoff: 0.5s, 1s, 2s, 4s between five attempts.
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+
+class _ClientPool:
+    """Lazily populated pool of space clients sharing one Hugging Face token.
+
+    ``size`` slots bound how many clients are checked out at once. A slot
+    holder reuses an idle client or connects a new one, so a failed connection
+    simply frees its slot for the next waiter to try again.
+    """
+
+    def __init__(self, hf_token: str | None, size: int) -> None:
+        self._hf_token = hf_token
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: queue.SimpleQueue[Client] = queue.SimpleQueue()
+
+    def acquire(self) -> Client:
+        """Take an idle client, connecting a new one if none is available."""
+
+        if not self._slots.acquire(timeout=REQUEST_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a free NLLB space client")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            # Imported here so processes that never translate skip loading gradio_client.
+            from gradio_client import Client
+
+            return Client(SPACE_ID, hf_token=self._hf_token)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, client: Client) -> None:
+        self._idle.put(client)
+        self._slots.release()
+
+
+_pools: dict[str | None, _ClientPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_for(hf_token: str | None) -> _ClientPool:
+    """Return the shared client pool for ``hf_token``, creating it on first use."""
+
+    pool = _pools.get(hf_token)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(hf_token, _ClientPool(hf_token, CLIENT_POOL_SIZE))
+    return pool
+
+
+@contextmanager
+def _pooled_client(hf_token: str | None = None) -> Iterator[Client]:
+    """Borrow a client from the pool for the duration of one request."""
+
+    pool = _pool_for(hf_token)
+    client = pool.acquire()
+    try:
+        yield client
+    finally:
+        pool.release(client)
+
+
+def _auth_headers(hf_token: str | None) -> dict[str, str] | None:
+    """Build request headers authenticating against the space, if a token is set."""
+
+    return {"Authorization": f"Bearer {hf_token}"} if hf_token else None
+
+
+def _build_session() -> requests.Session:
+    """Create a pooled keep-alive session.
+
+    Failed requests are retried by :func:`_predict`, so the adapter itself
+    does not retry.
+    """
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _resolve_rest_endpoint() -> tuple[requests.Session, int] | None:
+    """Look up the ``/translate`` function index from the space config.
+
+    A config without that endpoint settles the question for the process;
+    transient failures fall back to gradio_client until the cooldown expires.
+    """
+
+    global _session, _fn_index, _rest_resolved, _rest_retry_at
+
+    if _rest_resolved or time.monotonic() < _rest_retry_at:
+        return (_session, _fn_index) if _fn_index is not None else None
+
+    with _rest_lock:
+        if not _rest_resolved and time.monotonic() >= _rest_retry_at:
+            if not SPACE_URL:
+                _rest_resolved = True
+            else:
+                try:
+                    session = _build_session()
+                    response = session.get(f"{SPACE_URL}/config", timeout=REQUEST_TIMEOUT)
+                    if response.status_code == 404:
+                        dependencies = []
+                    else:
+                        response.raise_for_status()
+                        dependencies = response.json().get("dependencies", [])
+                except Exception:
+                    logger.warning(
+                        "Could not fetch %s/config; using gradio_client for %.0fs",
+                        SPACE_URL,
+                        REST_RETRY_COOLDOWN,
+                        exc_info=True,
+                    )
+                    _rest_retry_at = time.monotonic() + REST_RETRY_COOLDOWN
+                else:
+                    _fn_index = next(
+                        (
+                            index
+                            for index, dependency in enumerate(dependencies)
+                            if dependency.get("api_name") == "translate"
+                        ),
+                        None,
+                    )
+                    if _fn_index is None:
+                        logger.warning(
+                            "%s has no translate endpoint; using gradio_client", SPACE_URL
+                        )
+                    else:
+                        _session = session
+                    _rest_resolved = True
+
+    return (_session, _fn_index) if _fn_index is not None else None
+
+
+def _disable_rest_endpoint() -> None:
+    """Stop using the direct endpoint for the rest of the process."""
+
+    global _fn_index
+
+    with _rest_lock:
+        _fn_index = None
+
+
+def _rejects_payload(status: int) -> bool:
+    """Return whether a direct-endpoint status means the endpoint is unusable.
+
+    Any client error other than rate limiting (404, 405, 422, 403, ...) means
+    this space does not accept our payload, while gradio_client may still work.
+    """
+
+    return 400 <= status < 500 and status != 429
+
+
+def _predict_rest(text: str, src: str, tgt: str, hf_token: str | None) -> str | None:
+    """Translate via a direct POST, or return ``None`` if the endpoint is unusable."""
+
+    endpoint = _resolve_rest_endpoint()
+    if endpoint is None:
+        return None
+    session, fn_index = endpoint
+
+    response = session.post(
+        f"{SPACE_URL}/run/predict",
+        json={"data": [text, src, tgt], "fn_index": fn_index},
+        headers=_auth_headers(hf_token),
+        timeout=REQUEST_TIMEOUT,
+    )
+    if _rejects_payload(response.status_code):
+        logger.warning(
+            "%s/run/predict returned %d; using gradio_client",
+            SPACE_URL,
+            response.status_code,
+        )
+        _disable_rest_endpoint()
+        return None
+    response.raise_for_status()
+    return response.json()["data"][0]
+
+
+def _backoff_delays() -> Iterator[float]:
+    """Yield the wait before each retry, doubling up to ``RETRY_MAX_DELAY``."""
+
+    for attempt in range(MAX_ATTEMPTS - 1):
+        yield min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Return whether ``exc`` is worth retrying.
+
+    HTTP errors are retried only for rate limiting and server-side failures;
+    other 4xx responses are permanent. Otherwise only timeouts and broken
+    connections are retried, not malformed responses.
+    """
+
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # Only consult the HTTP libraries if something already imported them.
+    requests = sys.modules.get("requests")
+    if requests is not None and isinstance(
+        exc,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    ):
+        return True
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(exc, httpx.TransportError)
+
+
+def _send(text: str, src: str, tgt: str, hf_token: str | None = None) -> str:
+    """Send one translation request, preferring the keep-alive HTTP session.
+
+    Callers must hold a slot of ``_in_flight``.
+    """
+
+    result = _predict_rest(text, src, tgt, hf_token)
+    if result is not None:
+        return result
+
+    with _pooled_client(hf_token) as client:
+        return client.predict(
+            text=text,
+            src_lang=src,
+            tgt_lang=tgt,
+            api_name="/translate",
+        )
+
+
+def _predict_once(text: str, src: str, tgt: str, hf_token: str | None = None) -> str:
+    """Send one translation request once a process-wide request slot is free."""
+
+    with _in_flight:
+        return _send(text, src, tgt, hf_token)
+
+
+def _predict(text: str, src: str, tgt: str, hf_token: str | None = None) -> str:
+    """Send one translation request, retrying transient failures with backoff."""
+
+    delays = _backoff_delays()
+    while True:
+        try:
+            return _predict_once(text, src, tgt, hf_token)
+        except Exception as exc:
+            delay = next(delays, None)
+            if delay is None or not _is_transient(exc):
+                raise
+            logger.warning("Translation request failed (%s); retrying in %.1fs", exc, delay)
+            time.sleep(delay)
+
+
+_warm_up_thread: threading.Thread | None = None
+_warm_up_lock = threading.Lock()
+
+
+def _warm_up(src: str, tgt: str, hf_token: str | None) -> None:
+    try:
+        _predict_once(".", src, tgt, hf_token)
+    except Exception:
+        logger.debug("NLLB warm-up request failed", exc_info=True)
+
+
+def warm_up_space(src: str, tgt: str, hf_token: str | None = None) -> threading.Thread:
+    """Wake the space with a one-character request from a background thread.
+
+    The first request otherwise pays for DNS, TLS and the space's cold start
+    while real work waits behind it. The request is sent once per process;
+    later calls return the same (usually finished) thread so callers can wait
+    on it briefly. Failures are only logged; the actual translation requests
+    will surface (and retry) them.
+    """
+
+    global _warm_up_thread
+
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(
+                target=_warm_up,
+                args=(src, tgt, hf_token),
+                name="nllb-warmup",
+                daemon=True,
+            )
+            _warm_up_thread.start()
+        return _warm_up_thread
+
+
+def _cache_key(text: str) -> str:
+    """Normalize text for cache lookups.
+
+    Surrounding whitespace does not change the translation, so variants of the
+    same string share one cache entry.
+    """
+
+    return text.strip()
+
+
+def translate(
+    text: str,
+    src: str = "English",
+    tgt: str = "Western Persian",
+    hf_token: str | None = None,
+) -> str:
     """
     Translate arbitrary English text to Western Persian using the UNESCO/nllb space.
     This MUST call client.predict with exactly the same arguments as in my working example.
     """
-    if not text or not text.strip():
+    if not text:
+        return text
+    key = _cache_key(text)
+    if not key:
         return text
-    return client.predict(
-        text=text,
-        src_lang=src,
-        tgt_lang=tgt,
-        api_name="/translate",
+
+    cached = translation_cache.get(key, src, tgt)
+    if cached is not None:
+        return cached
+
+    result = _predict(text, src, tgt, hf_token)
+    if result:
+        translation_cache.put(key, src, tgt, str(result))
+    return result
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """Create an ``httpx.AsyncClient`` suited for :func:`atranslate` fan-out.
+
+    HTTP/2 is enabled when the optional ``h2`` package is installed so all
+    in-flight requests share one connection.
+    """
+
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=REQUEST_TIMEOUT,
     )
+
+
+async def _apredict_once(
+    client: httpx.AsyncClient, text: str, src: str, tgt: str, hf_token: str | None
+) -> str:
+    """Async counterpart of :func:`_predict_once` using the direct HTTP endpoint."""
+
+    # Poll rather than block so waiting for a slot never ties up the loop.
+    while not _in_flight.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_INTERVAL)
+    try:
+        return await _asend(client, text, src, tgt, hf_token)
+    finally:
+        _in_flight.release()
+
+
+async def _asend(
+    client: httpx.AsyncClient, text: str, src: str, tgt: str, hf_token: str | None
+) -> str:
+    """Async counterpart of :func:`_send`; callers must hold an ``_in_flight`` slot."""
+
+    if _rest_resolved:
+        endpoint = _resolve_rest_endpoint()
+    else:
+        endpoint = await asyncio.to_thread(_resolve_rest_endpoint)
+
+    if endpoint is not None:
+        _, fn_index = endpoint
+        response = await client.post(
+            f"{SPACE_URL}/run/predict",
+            json={"data": [text, src, tgt], "fn_index": fn_index},
+            headers=_auth_headers(hf_token),
+        )
+        if not _rejects_payload(response.status_code):
+            response.raise_for_status()
+            return response.json()["data"][0]
+        logger.warning(
+            "%s/run/predict returned %d; using gradio_client",
+            SPACE_URL,
+            response.status_code,
+        )
+        _disable_rest_endpoint()
+
+    # gradio_client is synchronous; keep the event loop free while it runs.
+    return await asyncio.to_thread(_send, text, src, tgt, hf_token)
+
+
+async def _apredict(
+    client: httpx.AsyncClient, text: str, src: str, tgt: str, hf_token: str | None
+) -> str:
+    """Async counterpart of :func:`_predict`, backing off without blocking the loop."""
+
+    delays = _backoff_delays()
+    while True:
+        try:
+            return await _apredict_once(client, text, src, tgt, hf_token)
+        except Exception as exc:
+            delay = next(delays, None)
+            if delay is None or not _is_transient(exc):
+                raise
+            logger.warning("Translation request failed (%s); retrying in %.1fs", exc, delay)
+            await asyncio.sleep(delay)
+
+
+async def atranslate(
+    client: httpx.AsyncClient,
+    text: str,
+    src: str = "English",
+    tgt: str = "Western Persian",
+    hf_token: str | None = None,
+) -> str:
+    """Async variant of :func:`translate` sharing the same translation cache."""
+
+    if not text:
+        return text
+    key = _cache_key(text)
+    if not key:
+        return text
+
+    cached = translation_cache.get(key, src, tgt)
+    if cached is not None:
+        return cached
+
+    result = await _apredict(client, text, src, tgt, hf_token)
+    if result:
+        translation_cache.put(key, src, tgt, str(result))
+    return result
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Dict, List
 
-import fitz
+from core.formula_detector import is_formula_like
 
 
 @dataclass
@@ -31,26 +33,28 @@ def _aggregate_span_weights(block: Dict) -> tuple[str, float | None, str | None]
     """
 
     texts: List[str] = []
-    font_weights: Dict[str, int] = {}
+    texts_append = texts.append
+    font_weights: defaultdict[str, int] = defaultdict(int)
     size_weighted_sum: float = 0.0
     total_size_weight: int = 0
 
-    for line in block.get("lines", []):
-        for span in line.get("spans", []):
+    # Called for every block on every page, so lookups are kept to a minimum.
+    # Text blocks from ``rawdict`` always carry ``lines`` and each span carries
+    # ``size`` and ``font``; ``text`` is optional (``rawdict`` uses ``chars``).
+    for line in block["lines"]:
+        for span in line["spans"]:
             text = span.get("text", "")
             weight = max(len(text.strip()), 1)
 
             if text:
-                texts.append(text)
+                texts_append(text)
 
-            size = span.get("size")
-            if isinstance(size, (int, float)):
-                size_weighted_sum += size * weight
-                total_size_weight += weight
+            size_weighted_sum += span["size"] * weight
+            total_size_weight += weight
 
-            font = span.get("font")
-            if isinstance(font, str) and font:
-                font_weights[font] = font_weights.get(font, 0) + weight
+            font = span["font"]
+            if font:
+                font_weights[font] += weight
 
     average_size: float | None = None
     if total_size_weight:
@@ -58,26 +62,30 @@ def _aggregate_span_weights(block: Dict) -> tuple[str, float | None, str | None]
 
     dominant_font: str | None = None
     if font_weights:
-        dominant_font = max(font_weights.items(), key=lambda item: item[1])[0]
+        dominant_font = max(font_weights, key=font_weights.__getitem__)
 
     return "".join(texts), average_size, dominant_font
 
 
-def extract_text_blocks(pdf_path: str) -> list[TextBlock]:
-    """Extract text blocks from a PDF file.
+def iter_text_blocks(pdf_path: str, detect_formulas: bool = True) -> Iterator[TextBlock]:
+    """Lazily yield text blocks from a PDF file, page by page.
 
     The function opens the PDF with PyMuPDF and walks through each page. Text
     blocks are collected from the ``rawdict`` representation, combining spans
     into a single text string and computing representative font metadata.
+    Because blocks are yielded as each page is parsed, consumers can start
+    working on early pages while later ones are still being extracted.
 
     Args:
         pdf_path: Path to the input PDF file.
+        detect_formulas: Whether to flag formula-like blocks while extracting,
+            saving callers a second pass over the blocks.
 
-    Returns:
-        A list of :class:`TextBlock` entries covering all pages in the document.
+    Yields:
+        :class:`TextBlock` entries in page order.
     """
 
-    blocks: list[TextBlock] = []
+    import fitz  # PyMuPDF is heavy; only load it when a PDF is actually parsed.
 
     with fitz.open(pdf_path) as document:
         for page_number, page in enumerate(document, start=1):
@@ -91,17 +99,31 @@ def extract_text_blocks(pdf_path: str) -> list[TextBlock]:
                     float(value) for value in block.get("bbox", (0.0, 0.0, 0.0, 0.0))
                 )
 
-                blocks.append(
-                    TextBlock(
-                        page_number=page_number,
-                        bbox=bbox,
-                        text=text,
-                        font_size=font_size,
-                        font_name=font_name,
-                    )
+                yield TextBlock(
+                    page_number=page_number,
+                    bbox=bbox,
+                    text=text,
+                    font_size=font_size,
+                    font_name=font_name,
+                    is_formula_like=is_formula_like(text) if detect_formulas else False,
                 )
 
-    return blocks
+
+def extract_text_blocks(pdf_path: str, detect_formulas: bool = True) -> list[TextBlock]:
+    """Extract text blocks from a PDF file.
+
+    Eager counterpart of :func:`iter_text_blocks`.
+
+    Args:
+        pdf_path: Path to the input PDF file.
+        detect_formulas: Whether to flag formula-like blocks while extracting,
+            saving callers a second pass over the blocks.
+
+    Returns:
+        A list of :class:`TextBlock` entries covering all pages in the document.
+    """
+
+    return list(iter_text_blocks(pdf_path, detect_formulas))
 
 
 if __name__ == "__main__":
@@ -3,13 +3,42 @@
 from __future__ import annotations
 
 import logging
-
-import fitz
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 
 from core.pdf_layout_extractor import TextBlock
 
 logger = logging.getLogger(__name__)
 
+_RTL_FONT_NAME = "rtl"
+"""Reference name under which the RTL font is registered on each page."""
+
+
+@lru_cache(maxsize=4)
+def _load_font(font_path: str) -> bytes:
+    """Read a font file once so every page can embed it from memory."""
+
+    with open(font_path, "rb") as handle:
+        return handle.read()
+
+
+def _block_order(block: TextBlock) -> tuple[int, float, float]:
+    """Sort key placing blocks by page, then top-to-bottom, then right-to-left."""
+
+    return block.page_number, block.bbox[1], -block.bbox[0]
+
+
+def _group_blocks_by_page(blocks: list[TextBlock]) -> dict[int, list[TextBlock]]:
+    """Sort all blocks once and bucket them by page number in reading order."""
+
+    return {
+        page_number: list(page_blocks)
+        for page_number, page_blocks in groupby(
+            sorted(blocks, key=_block_order), key=attrgetter("page_number")
+        )
+    }
+
 
 def rebuild_pdf_with_translations(
     src_pdf_path: str,
@@ -17,18 +46,24 @@ def rebuild_pdf_with_translations(
     blocks: list[TextBlock],
     rtl_font_path: str,
 ) -> None:
-    doc = fitz.open(src_pdf_path)
-    new = fitz.open()
+    import fitz  # PyMuPDF is heavy; only load it when a PDF is actually rebuilt.
+
+    grouped = _group_blocks_by_page(blocks)
+    font_buffer = _load_font(rtl_font_path)
+
+    with fitz.open(src_pdf_path) as doc, fitz.open() as new:
+        new_page = new.new_page
+        for page_index, src_page in enumerate(doc):
+            page_rect = src_page.rect
+            dst_page = new_page(width=page_rect.width, height=page_rect.height)
 
-    for page_index in range(len(doc)):
-        src_page = doc.load_page(page_index)
-        dst_page = new.new_page(width=src_page.rect.width, height=src_page.rect.height)
+            page_blocks = grouped.get(page_index, [])
 
-        page_blocks = [b for b in blocks if b.page_number == page_index]
+            logger.info("Rebuilder page %d will draw %d blocks", page_index, len(page_blocks))
 
-        logger.info("Rebuilder page %d will draw %d blocks", page_index, len(page_blocks))
+            if not page_blocks:
+                continue
 
-        if page_blocks:
             first = page_blocks[0]
             logger.info(
                 "Rebuilder page %d, first block bbox=%s text=%r",
@@ -37,9 +72,11 @@ def rebuild_pdf_with_translations(
                 first.text[:200],
             )
 
-        for b in page_blocks:
-            (x0, y0, x1, y1) = b.bbox
-            rect = fitz.Rect(x0, y0, x1, y1)
-            dst_page.insert_textbox(rect, b.text, fontfile=rtl_font_path)
+            # Register the font once per page instead of re-parsing it for
+            # every textbox.
+            dst_page.insert_font(fontname=_RTL_FONT_NAME, fontbuffer=font_buffer)
+            insert_textbox = dst_page.insert_textbox
+            for b in page_blocks:
+                insert_textbox(fitz.Rect(b.bbox), b.text, fontname=_RTL_FONT_NAME)
 
-    new.save(dst_pdf_path)
+        new.save(dst_pdf_path)
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import threading
+from collections.abc import Iterator
+from functools import cache
 
 from config import (
     DEFAULT_SOURCE_LANGUAGE,
     DEFAULT_TARGET_LANGUAGE,
+    HUGGINGFACE_TOKEN,
+    LOCAL_NLLB_MODEL_DIR,
 )
-from core.formula_detector import is_formula_like
-from core.pdf_layout_extractor import TextBlock, extract_text_blocks
+from core.nllb_api import new_async_client
+from core.pdf_layout_extractor import TextBlock, iter_text_blocks
 from core.pdf_rebuilder import rebuild_pdf_with_translations
 from core.translator_nllb import NLLBTranslator, TranslationError
 
@@ -21,14 +27,6 @@ DEFAULT_FONT_PATH = os.environ.get(
 logger = logging.getLogger(__name__)
 
 
-def mark_formula_blocks(blocks: list[TextBlock]) -> list[TextBlock]:
-    """Annotate text blocks with a heuristic formula flag."""
-
-    for block in blocks:
-        block.is_formula_like = is_formula_like(block.text)
-    return blocks
-
-
 def _resolve_font_path(rtl_font_path: str | None = None) -> str:
     """Validate that the RTL font path exists before rebuilding the PDF."""
 
@@ -45,11 +43,94 @@ def _resolve_font_path(rtl_font_path: str | None = None) -> str:
     return resolved_path
 
 
+_local_translator_lock = threading.Lock()
+
+
+@cache
+def _local_translator() -> NLLBTranslator | None:
+    """Load the local CTranslate2 model once per process, if configured.
+
+    The instance is shared by every job: the model is large, and a single
+    ``ctranslate2.Translator`` queues concurrent batches onto its own threads.
+    """
+
+    if not LOCAL_NLLB_MODEL_DIR:
+        return None
+    try:
+        from core.translator_ctranslate2 import CTranslate2Translator
+    except ImportError:
+        logger.warning(
+            "LOCAL_NLLB_MODEL_DIR is set but ctranslate2/transformers are not "
+            "installed; using the UNESCO/nllb space"
+        )
+        return None
+    return CTranslate2Translator(
+        LOCAL_NLLB_MODEL_DIR,
+        src_lang=DEFAULT_SOURCE_LANGUAGE,
+        tgt_lang=DEFAULT_TARGET_LANGUAGE,
+    )
+
+
+def _create_translator() -> NLLBTranslator:
+    """Prefer the shared local CTranslate2 model when configured, else the remote space."""
+
+    with _local_translator_lock:
+        translator = _local_translator()
+    if translator is not None:
+        return translator
+
+    return NLLBTranslator(
+        src_lang=DEFAULT_SOURCE_LANGUAGE,
+        tgt_lang=DEFAULT_TARGET_LANGUAGE,
+        hf_token=HUGGINGFACE_TOKEN,
+    )
+
+
+def _iter_translatable(input_path: str, blocks: list[TextBlock]) -> Iterator[TextBlock]:
+    """Extract blocks lazily, recording all of them and yielding those to translate.
+
+    Every block is appended to ``blocks`` for the rebuild step; formula-like
+    blocks are drawn verbatim, so they are never yielded for translation.
+    """
+
+    for block in iter_text_blocks(input_path):
+        block.page_number -= 1
+        blocks.append(block)
+        if not block.is_formula_like:
+            yield block
+
+
+def _log_translated(blocks: list[TextBlock], translated: list[TextBlock]) -> None:
+    logger.info(
+        "Translated %d blocks (%d formula blocks kept as-is)",
+        len(translated),
+        len(blocks) - len(translated),
+    )
+    logger.info(
+        "Block 0 after translation: %r",
+        blocks[0].text[:200] if blocks else "",
+    )
+
+
+def _rebuild(
+    input_path: str, output_path: str, blocks: list[TextBlock], rtl_font_path: str | None
+) -> None:
+    logger.info("Rebuilding translated PDF to %s", output_path)
+    font_path = _resolve_font_path(rtl_font_path)
+    rebuild_pdf_with_translations(
+        src_pdf_path=input_path,
+        dst_pdf_path=output_path,
+        blocks=blocks,
+        rtl_font_path=font_path,
+    )
+
+
 def run_translation_pipeline(
     input_path: str,
     output_path: str,
     *,
     rtl_font_path: str | None = None,
+    use_async: bool = False,
 ) -> None:
     """Orchestrate extraction, translation, and PDF rebuild.
 
@@ -57,39 +138,68 @@ def run_translation_pipeline(
         input_path: Location of the source PDF.
         output_path: Destination for the translated PDF.
         rtl_font_path: Optional override for the RTL font used when rebuilding.
+        use_async: Run :func:`arun_translation_pipeline` on a fresh event loop
+            instead of translating with the thread-pool based client.
     """
 
-    logger.info("Extracting text blocks from %s", input_path)
-    blocks = extract_text_blocks(input_path)
-    blocks = mark_formula_blocks(blocks)
-    for block in blocks:
-        block.page_number = block.page_number - 1
+    if use_async:
+        asyncio.run(
+            arun_translation_pipeline(input_path, output_path, rtl_font_path=rtl_font_path)
+        )
+        return
+
+    translator = _create_translator()
 
     logger.info(
-        "Translating %d blocks from %s to %s",
-        len(blocks),
+        "Extracting and translating text blocks from %s (%s to %s)",
+        input_path,
         DEFAULT_SOURCE_LANGUAGE,
         DEFAULT_TARGET_LANGUAGE,
     )
-    translator = NLLBTranslator(
-        src_lang=DEFAULT_SOURCE_LANGUAGE,
-        tgt_lang=DEFAULT_TARGET_LANGUAGE,
-    )
+    blocks: list[TextBlock] = []
     try:
-        blocks = translator.translate_blocks(blocks)
-        logger.info(
-            "Block 0 after translation: %r",
-            blocks[0].text[:200] if blocks else "",
-        )
+        # Blocks are handed to the translator as pages are parsed, so requests
+        # for early pages are in flight while later ones are still being
+        # extracted.
+        translated = translator.translate_blocks(_iter_translatable(input_path, blocks))
     except TranslationError:
         logger.exception("Translation failed")
         raise
+    _log_translated(blocks, translated)
 
-    logger.info("Rebuilding translated PDF to %s", output_path)
-    font_path = _resolve_font_path(rtl_font_path)
-    rebuild_pdf_with_translations(
-        src_pdf_path=input_path,
-        dst_pdf_path=output_path,
-        blocks=blocks,
-        rtl_font_path=font_path,
+    _rebuild(input_path, output_path, blocks, rtl_font_path)
+
+
+async def arun_translation_pipeline(
+    input_path: str,
+    output_path: str,
+    *,
+    rtl_font_path: str | None = None,
+) -> None:
+    """Async variant of :func:`run_translation_pipeline`.
+
+    Every request for the document goes through one ``httpx.AsyncClient``, so
+    its connection (and HTTP/2 session, when available) is set up once per
+    PDF. Extraction and rebuilding run in worker threads to keep the loop free.
+    """
+
+    translator = _create_translator()
+
+    logger.info(
+        "Extracting text blocks from %s (%s to %s)",
+        input_path,
+        DEFAULT_SOURCE_LANGUAGE,
+        DEFAULT_TARGET_LANGUAGE,
     )
+    blocks: list[TextBlock] = []
+    to_translate = await asyncio.to_thread(list, _iter_translatable(input_path, blocks))
+
+    try:
+        async with new_async_client() as client:
+            translated = await translator.atranslate_blocks(to_translate, client=client)
+    except TranslationError:
+        logger.exception("Translation failed")
+        raise
+    _log_translated(blocks, translated)
+
+    await asyncio.to_thread(_rebuild, input_path, output_path, blocks, rtl_font_path)
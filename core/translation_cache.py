@@ -0,0 +1,104 @@
+"""Two-level cache for translated text keyed by language pair and content.
+
+Lookups first consult a bounded in-process LRU and then a SQLite database so
+that strings repeated within a document or across jobs never hit the remote
+NLLB space twice.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from config import TRANSLATION_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_SIZE = 10_000
+"""Maximum number of translations kept in the in-process LRU."""
+
+
+def _cache_key(text: str, src: str, tgt: str) -> bytes:
+    """Return a compact digest identifying ``text`` for a language pair."""
+
+    return hashlib.blake2b(f"{src}|{tgt}|{text}".encode(), digest_size=16).digest()
+
+
+class TranslationCache:
+    """Thread-safe translation cache backed by memory and SQLite."""
+
+    def __init__(self, path: Path, memory_size: int = DEFAULT_MEMORY_SIZE) -> None:
+        self._path = path
+        self._memory_size = memory_size
+        self._memory: OrderedDict[bytes, str] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Callers must hold ``self._lock``."""
+
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key BLOB PRIMARY KEY, translation TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: bytes, translation: str) -> None:
+        """Insert into the memory LRU. Callers must hold ``self._lock``."""
+
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, src: str, tgt: str) -> str | None:
+        """Return the cached translation of ``text`` or ``None`` on a miss."""
+
+        key = _cache_key(text, src, tgt)
+        with self._lock:
+            translation = self._memory.get(key)
+            if translation is not None:
+                self._memory.move_to_end(key)
+                return translation
+
+            try:
+                row = self._connection().execute(
+                    "SELECT translation FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                logger.exception("Translation cache lookup failed")
+                return None
+            if row is None:
+                return None
+
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, text: str, src: str, tgt: str, translation: str) -> None:
+        """Store the translation of ``text`` in both cache levels."""
+
+        key = _cache_key(text, src, tgt)
+        with self._lock:
+            self._remember(key, translation)
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR IGNORE INTO translations (key, translation) VALUES (?, ?)",
+                    (key, translation),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                logger.exception("Translation cache write failed")
+
+
+translation_cache = TranslationCache(TRANSLATION_CACHE_PATH)
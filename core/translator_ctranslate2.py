@@ -0,0 +1,182 @@
+"""Translator backed by a local CTranslate2 conversion of NLLB.
+
+Importing this module requires ``ctranslate2`` and ``transformers``; the
+pipeline falls back to the remote UNESCO NLLB space when they are missing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, List
+
+import ctranslate2
+from transformers import AutoTokenizer
+
+from core.pdf_layout_extractor import TextBlock
+from core.translator_nllb import NLLBTranslator, TranslationError, _HAS_CONTENT
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# The UNESCO space takes human-readable language names while the model expects
+# FLORES-200 codes. Values that already look like codes are passed through.
+_NLLB_CODES = {
+    "Arabic": "arb_Arab",
+    "Chinese (Simplified)": "zho_Hans",
+    "English": "eng_Latn",
+    "French": "fra_Latn",
+    "German": "deu_Latn",
+    "Russian": "rus_Cyrl",
+    "Spanish": "spa_Latn",
+    "Turkish": "tur_Latn",
+    "Western Persian": "pes_Arab",
+}
+
+DEFAULT_LOCAL_BATCH_CHARS = 16000
+"""Characters handed to one ``translate_batch`` call; the model batches by tokens."""
+
+_MAX_BATCH_TOKENS = 4096
+
+# Greedy decoding is plenty for block-sized inputs and several times cheaper
+# than beam search. Output length is bounded relative to the longest source so
+# a degenerate hypothesis cannot run to the model's full context.
+_MAX_DECODING_LENGTH = 512
+_DECODING_LENGTH_RATIO = 1.5
+
+
+def _language_code(language: str) -> str:
+    """Return the FLORES-200 code NLLB uses for ``language``."""
+
+    code = _NLLB_CODES.get(language, language)
+    if "_" not in code:
+        raise TranslationError(f"No NLLB language code known for {language!r}")
+    return code
+
+
+class CTranslate2Translator(NLLBTranslator):
+    """Translate text with an NLLB model running in-process via CTranslate2.
+
+    ``model_dir`` must contain a model converted with
+    ``ct2-transformers-converter`` (for example ``nllb-200-distilled-600M``
+    quantized to int8). Blocks are grouped exactly as in
+    :class:`NLLBTranslator`, but each batch becomes one ``translate_batch``
+    call instead of a network round trip, so the GPU (or CPU) sees all
+    sentences of a batch at once. Merged units are translated line by line,
+    so their line structure always survives translation.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        src_lang: str = "English",
+        tgt_lang: str = "Western Persian",
+        tokenizer: str = "facebook/nllb-200-distilled-600M",
+        batch_chars: int = DEFAULT_LOCAL_BATCH_CHARS,
+        device: str | None = None,
+    ) -> None:
+        # A single model instance already uses every core it is given, so one
+        # instance is meant to be shared process-wide (see core.pipeline) and
+        # each call feeds it one batch at a time.
+        super().__init__(
+            src_lang, tgt_lang, batch_chars=batch_chars, concurrency=1, warm_up=False
+        )
+        # Fail on an unsupported language pair now rather than on every chunk.
+        _language_code(src_lang)
+        _language_code(tgt_lang)
+
+        self.device = device or ("cuda" if ctranslate2.get_cuda_device_count() else "cpu")
+        # int8 weights halve memory traffic: pair them with int8 arithmetic
+        # on CPU and fp16 activations on GPU tensor cores.
+        compute_type = "int8_float16" if self.device == "cuda" else "int8"
+        self._model = ctranslate2.Translator(
+            model_dir, device=self.device, compute_type=compute_type
+        )
+        self._tokenizer = AutoTokenizer.from_pretrained(tokenizer)
+        logger.info(
+            "Loaded local NLLB model from %s on %s (%s)", model_dir, self.device, compute_type
+        )
+
+    def _translate_lines(self, lines: List[str], src: str, tgt: str) -> List[str]:
+        """Translate non-empty ``lines`` in one batched model call."""
+
+        tokenizer = self._tokenizer
+        source = _language_code(src)
+        target = _language_code(tgt)
+        # NLLB inputs are ``[source code] tokens </s>``; building them here keeps
+        # the shared tokenizer free of per-call language state.
+        sources = [
+            [source]
+            + tokenizer.convert_ids_to_tokens(tokenizer.encode(line, add_special_tokens=False))
+            + [tokenizer.eos_token]
+            for line in lines
+        ]
+
+        results = self._model.translate_batch(
+            sources,
+            target_prefix=[[target]] * len(sources),
+            max_batch_size=_MAX_BATCH_TOKENS,
+            batch_type="tokens",
+            beam_size=1,
+            sampling_topk=1,
+            max_decoding_length=min(
+                _MAX_DECODING_LENGTH,
+                int(_DECODING_LENGTH_RATIO * max(map(len, sources))),
+            ),
+        )
+        # Each hypothesis starts with the target language token.
+        return [
+            tokenizer.decode(
+                tokenizer.convert_tokens_to_ids(result.hypotheses[0][1:]),
+                skip_special_tokens=True,
+            )
+            for result in results
+        ]
+
+    def _translate_chunk(self, chunk: List[str], src: str, tgt: str) -> List[str]:
+        """Translate every line of every text in ``chunk`` as a single batch."""
+
+        split = [text.split("\n") for text in chunk]
+        lines = [line for text_lines in split for line in text_lines if _HAS_CONTENT(line)]
+        if not lines:
+            return list(chunk)
+
+        try:
+            translated = iter(self._translate_lines(lines, src, tgt))
+        except TranslationError:
+            raise
+        except Exception as exc:
+            logger.exception("Translation error via local NLLB model")
+            raise TranslationError("Failed to translate text via local NLLB model") from exc
+
+        return [
+            "\n".join(next(translated) if _HAS_CONTENT(line) else line for line in text_lines)
+            for text_lines in split
+        ]
+
+    def _predict(self, text: str, src: str, tgt: str) -> str:
+        return self._translate_chunk([text], src, tgt)[0]
+
+    async def atranslate(
+        self,
+        text: str,
+        src_lang: str | None = None,
+        tgt_lang: str | None = None,
+    ) -> str:
+        """Run :meth:`translate` off the event loop; the model call is blocking."""
+
+        return await asyncio.to_thread(self.translate, text, src_lang, tgt_lang)
+
+    async def atranslate_blocks(
+        self,
+        blocks: List[TextBlock],
+        src_lang: str | None = None,
+        tgt_lang: str | None = None,
+        *,
+        client: httpx.AsyncClient | None = None,
+    ) -> List[TextBlock]:
+        """Run :meth:`translate_blocks` off the event loop; ``client`` is unused."""
+
+        return await asyncio.to_thread(self.translate_blocks, blocks, src_lang, tgt_lang)
@@ -2,14 +2,339 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Iterable, Iterator
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, List
 
-from core.nllb_api import translate
+from core.nllb_api import (
+    DEFAULT_MAX_WORKERS,
+    atranslate,
+    new_async_client,
+    translate,
+    warm_up_space,
+)
 from core.pdf_layout_extractor import TextBlock
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+# Several block texts are joined around this marker and translated in a single
+# request. The token is fixed (not random per run) so batched payloads still hit
+# the translation cache on repeat runs, and it holds neither letters nor digits,
+# which the model may re-case or localize.
+_BATCH_MARKER = "<<<|||>>>"
+_BATCH_SEPARATOR = f"\n{_BATCH_MARKER}\n"
+
+# Matches the first non-whitespace character without allocating a stripped copy.
+_HAS_CONTENT = re.compile(r"\S").search
+
+DEFAULT_BATCH_CHARS = 1500
+"""Upper bound on one batched request; NLLB truncates inputs past 512 tokens."""
+
+DEFAULT_GROUP_CHARS = 400
+"""Upper bound on a unit of merged adjacent blocks (roughly 100 tokens)."""
+
+_SMALL_BLOCK_CHARS = 80
+
+# Merging short blocks only pays off while the space keeps the newlines between
+# them; otherwise each merged block is re-requested on its own. Once enough
+# merged units of a call have come back, merging stays on for the rest of that
+# call only if at least half of them kept their line count.
+_MERGE_MIN_SAMPLES = 8
+_MERGE_MIN_SUCCESS = 0.5
+
+# Likewise, a call stops joining texts around the marker once too few of its
+# batched requests came back with every marker intact, and sends each text on
+# its own instead of paying for a failed batch and its fallback.
+_SPLIT_MIN_SAMPLES = 4
+_SPLIT_MIN_SUCCESS = 0.5
+
+# Failed requests leave their blocks in the source language, but a document in
+# which fewer than this share of units was translated is reported as a failure.
+_MIN_TRANSLATED_RATIO = 0.5
+
+# How long translate_blocks waits for the background warm-up request before
+# sending real work anyway.
+_WARM_UP_TIMEOUT = 5.0
+
+# Blocks that carry no prose (page numbers, citation keys such as ``[12]``,
+# bare URLs and DOIs) are left untouched: the model returns them unchanged at
+# best and garbled at worst, so sending them only costs a round trip.
+_NON_LINGUISTIC = re.compile(
+    r"^[\s\d\W]*$|^(?:https?://|www\.|doi:)\S*$|^10\.\d{4,9}/\S+$", re.IGNORECASE
+).match
+_MIN_ALPHA_CHARS = 3
+
+
+class _ChunkPacker:
+    """Incrementally pack texts into chunks whose joined size fits ``max_chars``."""
+
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self._current: List[str] = []
+        self._size = 0
+
+    def add(self, text: str) -> List[str] | None:
+        """Append ``text``, returning the previous chunk if ``text`` did not fit in it."""
+
+        cost = len(text) + len(_BATCH_SEPARATOR)
+        full = None
+        if self._current and self._size + cost > self.max_chars:
+            full = self.flush()
+        self._current.append(text)
+        self._size += cost
+        return full
+
+    def flush(self) -> List[str] | None:
+        """Return the chunk being filled, if any, and start a new one."""
+
+        chunk = self._current or None
+        self._current, self._size = [], 0
+        return chunk
+
+
+def _split_batch(chunk: List[str], result: str) -> List[str] | None:
+    """Split a batched translation back into one entry per text in ``chunk``.
+
+    Returns ``None`` when the space did not preserve the separators.
+    """
+
+    if len(chunk) == 1:
+        return [result]
+
+    parts = result.split(_BATCH_MARKER)
+    if len(parts) != len(chunk):
+        logger.warning(
+            "Batched translation returned %d segments for %d texts; "
+            "falling back to per-text requests",
+            len(parts),
+            len(chunk),
+        )
+        return None
+    return [part.strip() for part in parts]
+
+
+def _is_non_linguistic(text: str) -> bool:
+    """Return whether ``text`` (already stripped) has nothing worth translating."""
+
+    if _NON_LINGUISTIC(text):
+        return True
+    alpha = islice(filter(str.isalpha, text), _MIN_ALPHA_CHARS)
+    return sum(1 for _ in alpha) < _MIN_ALPHA_CHARS
+
+
+class _SuccessRate:
+    """Running success rate of one batching technique within a single call.
+
+    The technique stays enabled until ``min_samples`` outcomes are in and fewer
+    than ``min_success`` of them succeeded. Outcomes arrive from worker threads
+    while the calling thread keeps grouping, so later units adapt mid-document.
+    """
+
+    def __init__(self, name: str, min_samples: int, min_success: float) -> None:
+        self.name = name
+        self.min_samples = min_samples
+        self.min_success = min_success
+        self.attempts = 0
+        self.successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.attempts < self.min_samples
+            or self.successes >= self.min_success * self.attempts
+        )
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            was_enabled = self.enabled
+            self.attempts += 1
+            self.successes += success
+            if was_enabled and not self.enabled:
+                logger.warning(
+                    "Only %d of %d %s succeeded; disabling them for the rest of this call",
+                    self.successes,
+                    self.attempts,
+                    self.name,
+                )
+
+
+class _CallStats:
+    """Per-call record of which batched requests and merged units survived translation."""
+
+    def __init__(self) -> None:
+        self.merges = _SuccessRate("merged units", _MERGE_MIN_SAMPLES, _MERGE_MIN_SUCCESS)
+        self.splits = _SuccessRate("batched requests", _SPLIT_MIN_SAMPLES, _SPLIT_MIN_SUCCESS)
+        # Joined text of every merged unit -> number of blocks it holds.
+        self._merged: dict[str, int] = {}
+
+    def add_unit(self, members: List[str]) -> str:
+        """Return the text sent for a unit of ``members``, remembering merges."""
+
+        text = "\n".join(members)
+        if len(members) > 1:
+            self._merged[text] = len(members)
+        return text
+
+    def record_unit(self, text: str, result: str) -> None:
+        size = self._merged.get(text)
+        if size:
+            self.merges.record(result.count("\n") + 1 == size)
+
+    def record_parts(self, chunk: List[str], parts: List[str] | None) -> None:
+        """Record the outcome of a request that translated ``chunk``."""
+
+        if len(chunk) > 1:
+            self.splits.record(parts is not None)
+        if parts is not None:
+            for text, part in zip(chunk, parts):
+                self.record_unit(text, part)
+
+    def record_chunk(self, chunk: List[str], future: Future[List[str] | None]) -> None:
+        """Done callback recording the outcome of a chunk request."""
+
+        if not future.cancelled() and future.exception() is None:
+            self.record_parts(chunk, future.result())
+
+
+def _collecting(blocks: Iterable[TextBlock], sink: List[TextBlock]) -> Iterator[TextBlock]:
+    """Yield ``blocks`` unchanged while appending each one to ``sink``."""
+
+    for block in blocks:
+        sink.append(block)
+        yield block
+
+
+def _group_blocks(
+    blocks: Iterable[TextBlock],
+    occurrences: dict[str, List[int]],
+    stats: _CallStats,
+    max_chars: int = DEFAULT_GROUP_CHARS,
+) -> Iterator[List[str]]:
+    """Yield units of distinct translatable block texts.
+
+    Every translatable block is recorded in ``occurrences`` under its stripped
+    text, and only the first block holding a given text joins a unit, so
+    repeated texts (running headers, captions) are translated once whatever
+    their neighbours. Consecutive short first occurrences on the same page are
+    merged into one unit of at most ``max_chars`` characters while
+    ``stats.merges`` stays enabled. Longer blocks, and blocks that already
+    contain newlines, form units of their own. Blocks without prose (see
+    :func:`_is_non_linguistic`) keep their original text.
+    """
+
+    members: List[str] = []
+    size = 0
+    page = None
+
+    for index, block in enumerate(blocks):
+        if block.is_formula_like or not block.text or not _HAS_CONTENT(block.text):
+            continue
+        text = block.text.strip()
+        if _is_non_linguistic(text):
+            continue
+        indices = occurrences.get(text)
+        if indices is not None:
+            indices.append(index)
+            continue
+        occurrences[text] = [index]
+
+        mergeable = (
+            len(text) <= _SMALL_BLOCK_CHARS and "\n" not in text and stats.merges.enabled
+        )
+        if members and (
+            not mergeable or block.page_number != page or size + len(text) + 1 > max_chars
+        ):
+            yield members
+            members, size = [], 0
+
+        if not mergeable:
+            yield [text]
+            continue
+
+        members.append(text)
+        size += len(text) + 1
+        page = block.page_number
+
+    if members:
+        yield members
+
+
+def _split_units(
+    units: List[tuple[List[str], str]], translated: dict[str, str]
+) -> tuple[dict[str, str], List[str]]:
+    """Distribute unit translations back to individual block texts.
+
+    Returns the per-text translations together with the texts of merged units
+    whose line count did not survive translation; those still need to be
+    translated one at a time.
+    """
+
+    translations: dict[str, str] = {}
+    retry: List[str] = []
+
+    for members, text in units:
+        result = translated.get(text)
+        if result is None:
+            continue
+        if len(members) == 1:
+            translations[members[0]] = result
+            continue
+
+        lines = result.split("\n")
+        if len(lines) == len(members):
+            translations.update(zip(members, lines))
+        else:
+            retry.extend(members)
+
+    return translations, retry
+
+
+def _check_coverage(total: int, translated: int) -> None:
+    """Raise :class:`TranslationError` if too few units could be translated."""
+
+    if total and translated < total * _MIN_TRANSLATED_RATIO:
+        raise TranslationError(f"Only {translated} of {total} text units could be translated")
+
+
+def _apply_translations(
+    blocks: List[TextBlock], occurrences: dict[str, List[int]], translations: dict[str, str]
+) -> None:
+    """Write translations onto every block holding each text.
+
+    Blocks keep their original text when the translation came back empty.
+    """
+
+    # Sample a few originals up front so the assignment loop stays branch-free.
+    samples: List[tuple[int, str]] = []
+    if logger.isEnabledFor(logging.INFO):
+        samples = [
+            (occurrences[text][0], blocks[occurrences[text][0]].text)
+            for text in islice(translations, 3)
+        ]
+
+    for text, translated_text in translations.items():
+        if translated_text:
+            for index in occurrences[text]:
+                blocks[index].text = translated_text
+
+    for index, original_text in samples:
+        logger.info(
+            "Block %d translated:\n  original=%r\n  translated=%r",
+            index,
+            original_text[:200],
+            blocks[index].text[:200],
+        )
+
 
 class TranslationError(Exception):
     """Raised when translation via the NLLB space fails."""
@@ -21,16 +346,44 @@ class NLLBTranslator:
     This class is a light wrapper around :func:`core.nllb_api.translate`, which
     encapsulates the validated API call signature for the UNESCO/nllb Space.
     Default source and target languages can be provided at instantiation time,
-    but they can also be overridden per translation call.
+    but they can also be overridden per translation call. ``concurrency``
+    bounds how many requests a single :meth:`translate_blocks` call keeps in
+    flight; :data:`core.nllb_api.MAX_IN_FLIGHT` caps the total per process.
+    :meth:`atranslate_blocks` offers the same behavior on an event loop, gated
+    by ``async_concurrency``. Space clients are created on first use and
+    shared by all translators using the same ``hf_token``. Unless ``warm_up``
+    is false, the first translator in the process wakes the space from a
+    background thread (see :func:`core.nllb_api.warm_up_space`) so the
+    connection and the space are ready when the first batch arrives.
     """
 
     def __init__(
         self,
         src_lang: str = "English",
         tgt_lang: str = "Western Persian",
+        batch_chars: int = DEFAULT_BATCH_CHARS,
+        concurrency: int = DEFAULT_MAX_WORKERS,
+        async_concurrency: int = 16,
+        hf_token: str | None = None,
+        warm_up: bool = True,
     ) -> None:
         self.src_lang = src_lang
         self.tgt_lang = tgt_lang
+        self.batch_chars = batch_chars
+        self.concurrency = concurrency
+        self.async_concurrency = async_concurrency
+        self.hf_token = hf_token
+
+        self._warm_up: threading.Thread | None = None
+        if warm_up and src_lang != tgt_lang:
+            self._warm_up = warm_up_space(src_lang, tgt_lang, hf_token)
+
+    def _await_warm_up(self) -> None:
+        """Wait briefly for the background warm-up request, once."""
+
+        if self._warm_up is not None:
+            self._warm_up.join(_WARM_UP_TIMEOUT)
+            self._warm_up = None
 
     def translate(
         self,
@@ -45,45 +398,312 @@ class NLLBTranslator:
 
         src = src_lang or self.src_lang
         tgt = tgt_lang or self.tgt_lang
+        if src == tgt:
+            return text
+
+        return self._predict(text, src, tgt)
+
+    def _predict(self, text: str, src: str, tgt: str) -> str:
+        """Translate ``text`` with already-resolved languages.
+
+        This is the per-request hot path used by the batch helpers, so it skips
+        the default-language resolution done in :meth:`translate`.
+        """
 
         try:
-            return str(translate(text=text, src=src, tgt=tgt))
+            return str(translate(text=text, src=src, tgt=tgt, hf_token=self.hf_token))
         except Exception as exc:  # pragma: no cover - network interactions
             logger.exception("Translation error via UNESCO/nllb")
             raise TranslationError("Failed to translate text via UNESCO/nllb") from exc
 
+    def _translate_chunk(self, chunk: List[str], src: str, tgt: str) -> List[str] | None:
+        """Translate one chunk of texts with a single sentinel-joined request.
+
+        Returns ``None`` if the space did not return the same number of
+        segments; callers then translate the texts of the chunk one by one.
+        """
+
+        return _split_batch(chunk, self._predict(_BATCH_SEPARATOR.join(chunk), src, tgt))
+
+    def _gather_chunks(
+        self,
+        executor: ThreadPoolExecutor,
+        submitted: List[tuple[List[str], Future[List[str] | None]]],
+        src: str,
+        tgt: str,
+        stats: _CallStats,
+    ) -> dict[str, str]:
+        """Collect chunk results into a mapping from source text to translation.
+
+        Texts of chunks whose separators were lost are re-submitted to
+        ``executor`` individually, so the fallback requests still overlap.
+        Texts whose requests fail are left out of the result.
+        """
+
+        translated: dict[str, str] = {}
+        fallback: List[tuple[str, Future[str]]] = []
+        predict = partial(self._predict, src=src, tgt=tgt)
+
+        for chunk, future in submitted:
+            try:
+                parts = future.result()
+            except TranslationError:
+                # Retries are exhausted; keep these blocks in the source
+                # language rather than losing the rest of the document.
+                logger.warning("Keeping %d units untranslated", len(chunk))
+                continue
+            if parts is None:
+                fallback.extend((text, executor.submit(predict, text)) for text in chunk)
+            else:
+                translated.update(zip(chunk, parts))
+
+        for text, future in fallback:
+            try:
+                translated[text] = future.result()
+            except TranslationError:
+                logger.warning("Keeping a unit untranslated")
+            else:
+                stats.record_unit(text, translated[text])
+
+        return translated
+
+    def _translate_texts(
+        self, texts: Iterable[str], src: str, tgt: str, stats: _CallStats
+    ) -> dict[str, str]:
+        """Translate distinct ``texts`` with as few requests as possible.
+
+        Texts are packed into chunks of at most ``batch_chars`` characters and
+        each chunk is submitted as soon as it fills up, so ``texts`` may be a
+        generator that is still grouping blocks. See :meth:`_gather_chunks` for
+        the returned mapping.
+        """
+
+        # The languages are fixed for the whole call, so bind them once.
+        translate_chunk = partial(self._translate_chunk, src=src, tgt=tgt)
+        packer = _ChunkPacker(self.batch_chars)
+        submitted: List[tuple[List[str], Future[List[str] | None]]] = []
+        slots = threading.BoundedSemaphore(self.concurrency)
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="nllb"
+        ) as executor:
+
+            def submit(chunk: List[str]) -> None:
+                # Extraction has been running meanwhile; only the first
+                # request waits for the warm-up.
+                self._await_warm_up()
+                # Waiting for a free worker before grouping further lets later
+                # units see the outcomes of earlier ones.
+                slots.acquire()
+                future = executor.submit(translate_chunk, chunk)
+                future.add_done_callback(partial(stats.record_chunk, chunk))
+                future.add_done_callback(lambda _: slots.release())
+                submitted.append((chunk, future))
+
+            for text in texts:
+                if not stats.splits.enabled:
+                    packer.max_chars = 0
+                chunk = packer.add(text)
+                if chunk:
+                    submit(chunk)
+
+            chunk = packer.flush()
+            if chunk:
+                submit(chunk)
+
+            return self._gather_chunks(executor, submitted, src, tgt, stats)
+
     def translate_blocks(
+        self,
+        blocks: Iterable[TextBlock],
+        src_lang: str | None = None,
+        tgt_lang: str | None = None,
+    ) -> List[TextBlock]:
+        """Translate a collection of :class:`TextBlock` instances in-place.
+
+        Identical block texts are translated once, short adjacent blocks are
+        merged into units (see :func:`_group_blocks`), and the units are packed
+        into batched requests whose round trips overlap.
+
+        ``blocks`` may be a lazy iterable such as
+        :func:`core.pdf_layout_extractor.iter_text_blocks`: each batch is
+        submitted as soon as it fills up, so translation of early pages overlaps
+        extraction of later ones. All consumed blocks are returned as a list.
+
+        Transient network errors are retried by :mod:`core.nllb_api`; blocks
+        whose requests still fail keep their original text. If fewer than half
+        of the units could be translated, :class:`TranslationError` is raised.
+        """
+
+        src = src_lang or self.src_lang
+        tgt = tgt_lang or self.tgt_lang
+        if src == tgt:
+            # Nothing to do, but still drain lazy input so callers see every block.
+            return list(blocks)
+
+        stats = _CallStats()
+        collected: List[TextBlock] = []
+        occurrences: dict[str, List[int]] = {}
+        units: List[tuple[List[str], str]] = []
+
+        def unit_texts() -> Iterator[str]:
+            for members in _group_blocks(_collecting(blocks, collected), occurrences, stats):
+                text = stats.add_unit(members)
+                units.append((members, text))
+                yield text
+
+        translated = self._translate_texts(unit_texts(), src, tgt, stats)
+        _check_coverage(len(units), len(translated))
+
+        translations, retry = _split_units(units, translated)
+        if retry:
+            translations.update(self._translate_texts(retry, src, tgt, stats))
+
+        _apply_translations(collected, occurrences, translations)
+        return collected
+
+    async def atranslate(
+        self,
+        text: str,
+        src_lang: str | None = None,
+        tgt_lang: str | None = None,
+    ) -> str:
+        """Async variant of :meth:`translate` using a short-lived HTTP client."""
+
+        if text is None or text == "":
+            return text
+
+        src = src_lang or self.src_lang
+        tgt = tgt_lang or self.tgt_lang
+        if src == tgt:
+            return text
+
+        try:
+            async with new_async_client() as client:
+                return str(await atranslate(client, text, src, tgt, self.hf_token))
+        except Exception as exc:  # pragma: no cover - network interactions
+            logger.exception("Translation error via UNESCO/nllb")
+            raise TranslationError("Failed to translate text via UNESCO/nllb") from exc
+
+    async def _atranslate_chunk(
+        self, client: httpx.AsyncClient, chunk: List[str], src: str, tgt: str, stats: _CallStats
+    ) -> dict[str, str]:
+        """Async counterpart of :meth:`_translate_chunk` including its per-text fallback.
+
+        As in the threaded path, texts whose requests fail are left out of the
+        returned mapping instead of aborting the whole batch.
+        """
+
+        async def one(text: str) -> str:
+            return str(await atranslate(client, text, src, tgt, self.hf_token))
+
+        try:
+            parts = _split_batch(chunk, await one(_BATCH_SEPARATOR.join(chunk)))
+        except Exception as exc:  # pragma: no cover - network interactions
+            logger.warning("Keeping %d units untranslated: %s", len(chunk), exc)
+            return {}
+        stats.record_parts(chunk, parts)
+        if parts is not None:
+            return dict(zip(chunk, parts))
+
+        results = await asyncio.gather(*map(one, chunk), return_exceptions=True)
+        translated = {}
+        for text, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                logger.warning("Keeping a unit untranslated: %s", result)
+            else:
+                stats.record_unit(text, result)
+                translated[text] = result
+        return translated
+
+    async def _atranslate_texts(
+        self,
+        client: httpx.AsyncClient,
+        texts: Iterable[str],
+        src: str,
+        tgt: str,
+        stats: _CallStats,
+    ) -> dict[str, str]:
+        """Async counterpart of :meth:`_translate_texts` built on ``asyncio`` tasks."""
+
+        slots = asyncio.Semaphore(self.async_concurrency)
+        packer = _ChunkPacker(self.batch_chars)
+        tasks: List[asyncio.Task[dict[str, str]]] = []
+
+        async def run(chunk: List[str]) -> dict[str, str]:
+            try:
+                return await self._atranslate_chunk(client, chunk, src, tgt, stats)
+            finally:
+                slots.release()
+
+        async def submit(chunk: List[str]) -> None:
+            if self._warm_up is not None:
+                await asyncio.to_thread(self._await_warm_up)
+            # Waiting for a free slot before grouping further lets later units
+            # see the outcomes of earlier ones.
+            await slots.acquire()
+            tasks.append(asyncio.create_task(run(chunk)))
+
+        for text in texts:
+            if not stats.splits.enabled:
+                packer.max_chars = 0
+            chunk = packer.add(text)
+            if chunk:
+                await submit(chunk)
+
+        chunk = packer.flush()
+        if chunk:
+            await submit(chunk)
+
+        translated: dict[str, str] = {}
+        for result in await asyncio.gather(*tasks):
+            translated.update(result)
+        return translated
+
+    async def atranslate_blocks(
         self,
         blocks: List[TextBlock],
         src_lang: str | None = None,
         tgt_lang: str | None = None,
+        *,
+        client: httpx.AsyncClient | None = None,
     ) -> List[TextBlock]:
-        """Translate a collection of :class:`TextBlock` instances in-place."""
+        """Async variant of :meth:`translate_blocks`.
+
+        All batched requests are multiplexed over one ``httpx.AsyncClient``
+        instead of a thread pool, with at most ``async_concurrency`` batches in
+        flight. Pass ``client`` to share a connection across calls; otherwise a
+        client is opened for this call only. Failed requests are handled as in
+        :meth:`translate_blocks`.
+        """
 
-        translated_count = 0
+        if client is None:
+            async with new_async_client() as client:
+                return await self.atranslate_blocks(blocks, src_lang, tgt_lang, client=client)
 
         src = src_lang or self.src_lang
         tgt = tgt_lang or self.tgt_lang
+        if src == tgt:
+            return blocks
 
-        for index, block in enumerate(blocks):
-            if block.is_formula_like or not block.text or not block.text.strip():
-                continue
+        stats = _CallStats()
+        occurrences: dict[str, List[int]] = {}
+        units: List[tuple[List[str], str]] = []
 
-            original_text = block.text
-            translated_text = self.translate(original_text, src, tgt)
-            if translated_text == "" and original_text:
-                translated_text = original_text
-            block.text = translated_text
-
-            if translated_count < 3:
-                logger.info(
-                    "Block %d translated:\n  original=%r\n  translated=%r",
-                    index,
-                    original_text[:200],
-                    translated_text[:200],
-                )
-            translated_count += 1
+        def unit_texts() -> Iterator[str]:
+            for members in _group_blocks(blocks, occurrences, stats):
+                text = stats.add_unit(members)
+                units.append((members, text))
+                yield text
+
+        translated = await self._atranslate_texts(client, unit_texts(), src, tgt, stats)
+        _check_coverage(len(units), len(translated))
+
+        translations, retry = _split_units(units, translated)
+        if retry:
+            translations.update(await self._atranslate_texts(client, retry, src, tgt, stats))
 
+        _apply_translations(blocks, occurrences, translations)
         return blocks
 
 
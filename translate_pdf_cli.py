@@ -21,6 +21,12 @@ def parse_args() -> argparse.Namespace:
         dest="rtl_font",
         help="Override the RTL font path used when rebuilding the PDF",
     )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Translate blocks concurrently on an asyncio event loop",
+    )
     return parser.parse_args()
 
 
@@ -32,6 +38,7 @@ def main() -> None:
         args.input_path,
         args.output_path,
         rtl_font_path=args.rtl_font,
+        use_async=args.use_async,
     )
     logger.info("Finished writing translated PDF to %s", args.output_path)
 if __name__ == "__main__":